@@ -8,15 +8,18 @@ https://github.com/sphinx-doc/sphinx/blob/master/sphinx/ext/doctest.py
 import doctest
 import enum
 import re
+import reprlib
 import sys
 import textwrap
 import traceback
+import types
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
 from typing import Iterator
 from typing import List
+from typing import Mapping
 from typing import Optional
 from typing import Tuple
 from typing import Union
@@ -59,6 +62,10 @@ _DIRECTIVES_W_SKIPIF = (
     SphinxDoctestDirectives.DOCTEST,
 )
 
+_DIRECTIVES_BY_NAME = {
+    directive.name.lower(): directive for directive in SphinxDoctestDirectives
+}
+
 
 def pytest_collect_file(
     file_path: Path, parent: Union[Session, Package]
@@ -94,6 +101,10 @@ def _is_doctest(config: Config, path: Path, parent: Union[Session, Package]) ->
 # with ":options:".
 _OPTION_DIRECTIVE_RE = re.compile(r':options:\s*([^\n\'"]*)$')
 _OPTION_SKIPIF_RE = re.compile(r':skipif:\s*([^\n\'"]*)$')
+_OPTION_SPLIT_RE = re.compile(r"[,\s]+")
+_OPTIONFLAGS_BY_NAME = doctest.OPTIONFLAGS_BY_NAME
+# shared by all sections and examples without options; read-only
+_EMPTY_OPTIONS: Mapping[int, bool] = types.MappingProxyType({})
 
 _DIRECTIVE_RE = re.compile(
     r"""
@@ -105,11 +116,12 @@ _DIRECTIVE_RE = re.compile(
     """,
     re.VERBOSE,
 )
+_GROUP_SPLIT_RE = re.compile(r"\s*,\s*")
 
 
 def _split_into_body_and_options(
     section_content: str,
-) -> Tuple[str, Optional[str], Dict[int, bool]]:
+) -> Tuple[str, Optional[str], Mapping[int, bool]]:
     """Parse the the full content of a directive and split it.
 
     It is split into a string, where the options (:options:, :hide: and
@@ -130,7 +142,7 @@ def _split_into_body_and_options(
     -------
     body : str
     skipif_expr : str or None
-    flag_settings : dict
+    flag_settings : mapping
 
     Raises
     ------
@@ -143,27 +155,30 @@ def _split_into_body_and_options(
     lines = section_content.strip().splitlines()
 
     skipif_expr = None
-    flag_settings = {}
+    flag_settings: Optional[Dict[int, bool]] = None
     i = 0
     for line in lines:
         stripped = line.strip()
-        if _OPTION_SKIPIF_RE.match(stripped):
-            skipif_match = _OPTION_SKIPIF_RE.match(stripped)
-            assert skipif_match is not None
+        if not stripped.startswith(":"):
+            break
+        skipif_match = _OPTION_SKIPIF_RE.match(stripped)
+        if skipif_match:
             skipif_expr = skipif_match.group(1)
             i += 1
-        elif _OPTION_DIRECTIVE_RE.match(stripped):
-            directive_match = _OPTION_DIRECTIVE_RE.match(stripped)
-            assert directive_match is not None
-            option_strings = directive_match.group(1).replace(",", " ").split()
-            for option in option_strings:
-                if (
-                    option[0] not in "+-"
-                    or option[1:] not in doctest.OPTIONFLAGS_BY_NAME
-                ):
-                    raise ValueError(f"doctest has an invalid option {option}")
-                flag = doctest.OPTIONFLAGS_BY_NAME[option[1:]]
-                flag_settings[flag] = option[0] == "+"
+            continue
+        directive_match = _OPTION_DIRECTIVE_RE.match(stripped)
+        if directive_match:
+            option_strings = directive_match.group(1)
+            if option_strings:
+                for option in _OPTION_SPLIT_RE.split(option_strings):
+                    if not option:
+                        continue
+                    flag = _OPTIONFLAGS_BY_NAME.get(option[1:])
+                    if option[0] not in "+-" or flag is None:
+                        raise ValueError(f"doctest has an invalid option {option}")
+                    if flag_settings is None:
+                        flag_settings = {}
+                    flag_settings[flag] = option[0] == "+"
             i += 1
         elif stripped == ":hide:":
             i += 1
@@ -181,6 +196,8 @@ def _split_into_body_and_options(
         # no newline between option block and body
         raise ValueError(f"invalid option block: {section_content!r}")
 
+    if flag_settings is None:
+        return body, skipif_expr, _EMPTY_OPTIONS
     return body, skipif_expr, flag_settings
 
 
@@ -200,6 +217,8 @@ SectionGroups = Optional[List[str]]
 
 
 class Section:
+    __slots__ = ("directive", "groups", "lineno", "body", "skipif_expr", "options")
+
     def __init__(
         self,
         directive: SphinxDoctestDirectives,
@@ -221,6 +240,13 @@ class Section:
         self.skipif_expr = skipif_expr
         self.options = options
 
+    def __repr__(self) -> str:
+        # the body can be arbitrarily long, so abbreviate it
+        return (
+            f"{type(self).__name__}(directive={self.directive}, "
+            f"lineno={self.lineno}, body={reprlib.repr(self.body)})"
+        )
+
 
 def get_sections(docstring: str) -> List[Union[Any, Section]]:
     lines = textwrap.dedent(docstring).splitlines()
@@ -248,11 +274,12 @@ def get_sections(docstring: str) -> List[Union[Any, Section]]:
         except IndexError:
             break
 
-        match = _DIRECTIVE_RE.match(line)
+        # cheap literal check before running the directive regex on every line
+        match = _DIRECTIVE_RE.match(line) if ".." in line else None
         if match:
             group = match.groupdict()
-            directive = getattr(SphinxDoctestDirectives, group["directive"].upper())
-            groups = [x.strip() for x in (group["argument"] or "default").split(",")]
+            directive = _DIRECTIVES_BY_NAME[group["directive"]]
+            groups = _GROUP_SPLIT_RE.split(group["argument"].strip() or "default")
             indentation = _get_indentation(line)
             # find the end of the block
             j = i
@@ -287,10 +314,10 @@ def docstring2examples(
 
     def get_testoutput_section_data(
         section: "Section",
-    ) -> Tuple[str, Dict[int, bool], int, Optional[Any]]:
+    ) -> Tuple[str, Mapping[int, bool], int, Optional[Any]]:
         want = section.body
         exc_msg = None
-        options: Dict[int, bool] = {}
+        options = _EMPTY_OPTIONS
 
         if section.skipif_expr and eval(section.skipif_expr, globs):
             want = ""
@@ -321,7 +348,7 @@ def docstring2examples(
                 # no unskipped testoutput section
                 # do we really need doctest.Example to test
                 # independent TESTCODE sections?
-                want, options, exc_msg = "", {}, None
+                want, options, exc_msg = "", _EMPTY_OPTIONS, None
 
             if current_section.skipif_expr and eval(current_section.skipif_expr, globs):
                 # TODO add the doctest.Example to `examples` but mark it as
@@ -338,7 +365,8 @@ def docstring2examples(
                     # lines
                     # TODO why do we want to hide testoutput??
                     lineno=current_section.lineno,
-                    options=options,
+                    # doctest.Example owns a mutable dict of options
+                    options=dict(options),
                 )
             )
     return examples
@@ -499,6 +527,8 @@ class SphinxDocTestRunner(doctest.DebugRunner):
 
 
 class SphinxDocTestParser:
+    __slots__ = ()
+
     def get_doctest(
         self,
         docstring: str,
@@ -525,15 +555,8 @@ class SphinxDoctestTextfile(pytest.Module):
         # inspired by doctest.testfile; ideally we would use it directly,
         # but it doesn't support passing a custom checker
         encoding = self.config.getini("doctest_encoding")
-        text = self.fspath.read_text(encoding)
-        name = self.fspath.basename
-
-        optionflags = _pytest.doctest.get_optionflags(self)  # type:ignore
-        runner = SphinxDocTestRunner(
-            verbose=False,
-            optionflags=optionflags,
-            checker=_pytest.doctest._get_checker(),
-        )
+        text = self.path.read_text(encoding=encoding)
+        name = self.path.name
 
         test = doctest.DocTest(
             examples=docstring2examples(text),
@@ -543,19 +566,28 @@ class SphinxDoctestTextfile(pytest.Module):
             lineno=0,
             docstring=text,
         )
+        if not test.examples:
+            # don't bother setting up a runner for files without examples
+            return
 
-        if test.examples:
-            yield DoctestItem.from_parent(
-                parent=self,  # type:ignore
-                name=test.name,
-                runner=runner,
-                dtest=test,
-            )
+        optionflags = _pytest.doctest.get_optionflags(self)  # type:ignore
+        runner = SphinxDocTestRunner(
+            verbose=False,
+            optionflags=optionflags,
+            checker=_pytest.doctest._get_checker(),
+        )
+
+        yield DoctestItem.from_parent(
+            parent=self,  # type:ignore
+            name=test.name,
+            runner=runner,
+            dtest=test,
+        )
 
 
 class SphinxDoctestModule(pytest.Module):
     def collect(self) -> Iterator[_pytest.doctest.DoctestItem]:
-        if self.fspath.basename == "conftest.py":
+        if self.path.name == "conftest.py":
             module = self.config.pluginmanager._importconftest(
                 self.path,
                 self.config.getoption("importmode"),
@@ -1,6 +1,7 @@
 import doctest
 import os
 import textwrap
+from typing import List
 
 import pytest
 
@@ -31,6 +32,7 @@ def test_simple(in_between_content: str) -> None:
     assert example.want == "{'3': 4,\n '5': 6}\n"
     assert example.exc_msg is None
     assert example.options == {}
+    assert isinstance(example.options, dict)
     assert example.lineno == 5
 
 
@@ -91,8 +93,45 @@ def test_cartopy() -> None:
     rstpath = os.path.join(
         os.path.dirname(__file__), "testdata", "using_the_shapereader.rst"
     )
-    with open(rstpath) as fh:
+    with open(rstpath, encoding="utf-8") as fh:
         sections = get_sections(fh.read())
 
     assert len(sections) == 9
     assert sections[0].groups == ["countries"]
+
+
+@pytest.mark.parametrize(
+    "argument,expected_groups",
+    [
+        ("", ["default"]),
+        ("group1", ["group1"]),
+        ("group1,group2", ["group1", "group2"]),
+        ("group1 , group two", ["group1", "group two"]),
+    ],
+)
+def test_groups(argument: str, expected_groups: List[str]) -> None:
+    doc = f"""
+.. testcode:: {argument}
+
+    print("Banana")
+"""
+
+    sections = get_sections(doc)
+    assert len(sections) == 1
+    assert sections[0].groups == expected_groups
+
+
+def test_section_repr() -> None:
+    doc = """
+.. testcode::
+
+    print("{}")
+""".format(
+        "x" * 1000
+    )
+
+    (section,) = get_sections(doc)
+    assert repr(section).startswith(
+        "Section(directive=SphinxDoctestDirectives.TESTCODE, lineno=3, body='print"
+    )
+    assert len(repr(section)) < 100
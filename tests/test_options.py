@@ -33,6 +33,22 @@ def test_mulitple_options() -> None:
     }
 
 
+def test_empty_options() -> None:
+    want = "\n:options:\n\ncodeblock"
+
+    ret = _split_into_body_and_options(want)
+    assert ret[0] == "codeblock"
+    assert ret[2] == {}
+
+
+def test_options_trailing_comma() -> None:
+    want = "\n:options: +ELLIPSIS,\n\ncodeblock"
+
+    ret = _split_into_body_and_options(want)
+    assert ret[0] == "codeblock"
+    assert ret[2] == {doctest.ELLIPSIS: True}
+
+
 def test_multiline_code() -> None:
     want = textwrap.dedent(
         """
@@ -1,15 +1,12 @@
 """ Run tests that call "sphinx-build -M doctest". """
 import logging
-import os
+import shutil
 import subprocess
 import textwrap
 from pathlib import Path
-from typing import Iterator
-from typing import Union
 
 import pytest
 from _pytest.legacypath import Testdir
-from py._path.local import LocalPath
 
 logger = logging.getLogger(__name__)
 
@@ -17,68 +14,87 @@ logger = logging.getLogger(__name__)
 class SphinxDoctestRunner:
     def __init__(self, tmp_path: Path) -> None:
         self.tmp_path: Path = tmp_path
-        subprocess.check_output(
-            [
-                "sphinx-quickstart",
-                "-v",
-                "0.1",
-                "-r",
-                "0.1",
-                "-l",
-                "en",
-                "-a",
-                "my.name",
-                "--ext-doctest",  # enable doctest extension
-                "--sep",
-                "-p",
-                "demo",
-                ".",
-            ]
-        )
 
     def __call__(
         self, rst_file_content: str, must_raise: bool = False, sphinxopts: None = None
     ) -> str:
         index_rst = self.tmp_path / "source" / "index.rst"
-        rst_file_content = textwrap.dedent(rst_file_content)
         index_rst.write_text(rst_file_content, encoding="utf-8")
-        logger.info("CWD: %s", os.getcwd())
         logger.info("content of index.rst:\n%s", rst_file_content)
 
-        cmd = ["sphinx-build", "-M", "doctest", "source", ""]
+        cmd = [
+            "sphinx-build",
+            "-M",
+            "doctest",
+            str(self.tmp_path / "source"),
+            str(self.tmp_path / "build"),
+        ]
         if sphinxopts:
             cmd.append(sphinxopts)
 
-        def to_str(subprocess_output: Union[str, bytes]) -> str:
-            if isinstance(subprocess_output, bytes):
-                output_str = "\n".join(subprocess_output.decode().splitlines())
-            else:
-                output_str = subprocess_output
-            logger.info("%s produced:\n%s", cmd, output_str)
-            return output_str
-
+        # text mode lets the io layer decode and normalize the line endings
         if must_raise:
             with pytest.raises(subprocess.CalledProcessError) as excinfo:
-                subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-            return to_str(excinfo.value.output)
-        return to_str(subprocess.check_output(cmd))
+                subprocess.run(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    check=True,
+                    cwd=self.tmp_path,
+                )
+            output: str = excinfo.value.output
+        else:
+            output = subprocess.run(
+                cmd, stdout=subprocess.PIPE, text=True, check=True, cwd=self.tmp_path
+            ).stdout
+        logger.info("%s produced:\n%s", cmd, output)
+        return output
+
+
+@pytest.fixture(scope="session")
+def sphinx_skeleton_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Run sphinx-quickstart once and share the result between tests."""
+    skeleton_dir = tmp_path_factory.mktemp("sphinx_skeleton")
+    subprocess.check_output(
+        [
+            "sphinx-quickstart",
+            "-v",
+            "0.1",
+            "-r",
+            "0.1",
+            "-l",
+            "en",
+            "-a",
+            "my.name",
+            "--ext-doctest",  # enable doctest extension
+            "--sep",
+            "-p",
+            "demo",
+            str(skeleton_dir),
+        ]
+    )
+    return skeleton_dir
 
 
 @pytest.fixture
-def sphinx_tester(tmpdir: LocalPath) -> Iterator[SphinxDoctestRunner]:
-    with tmpdir.as_cwd():
-        yield SphinxDoctestRunner(tmpdir)
+def sphinx_tester(tmp_path: Path, sphinx_skeleton_dir: Path) -> SphinxDoctestRunner:
+    project_dir = tmp_path / "proj"
+    shutil.copytree(sphinx_skeleton_dir, project_dir)
+    return SphinxDoctestRunner(project_dir)
 
 
 def test_simple_doctest_failure(sphinx_tester: SphinxDoctestRunner) -> None:
 
     output = sphinx_tester(
-        """
-        ===!!!
+        textwrap.dedent(
+            """
+            ===!!!
 
-        >>> 3 + 3
-        5
-        """,
+            >>> 3 + 3
+            5
+            """
+        ),
         must_raise=True,
     )
 
@@ -98,21 +114,85 @@ def test_simple_doctest_failure(sphinx_tester: SphinxDoctestRunner) -> None:
 
 def test_simple_doctest_success(sphinx_tester: SphinxDoctestRunner) -> None:
     output = sphinx_tester(
-        """
-        ===!!!
+        textwrap.dedent(
+            """
+            ===!!!
 
-        >>> 3 + 3
-        6
-        """
+            >>> 3 + 3
+            6
+            """
+        )
     )
     assert "1 items passed all tests" in output
 
 
+_SKIPIF_TRUE_TMPL = textwrap.dedent(
+    """
+    .. testcode::
+
+        {testcode}
+
+    .. testoutput::
+        :skipif: True
+
+        NOT EVALUATED
+    """
+)
+
+_SKIPIF_FALSE_TMPL = textwrap.dedent(
+    """
+    .. testcode::
+
+        {testcode}
+
+    .. testoutput::
+        :skipif: False
+
+        EVALUATED
+    """
+)
+
+_SKIPIF_MULTIPLE_TESTOUTPUT_TMPL = textwrap.dedent(
+    """
+    .. testcode::
+
+        raise RuntimeError
+
+    .. testoutput::
+        :skipif: True
+
+        NOT EVALUATED
+
+    .. testoutput::
+        :skipif: False
+
+        Traceback (most recent call last):
+            ...
+        {exception}
+    """
+)
+
+_SKIPIF_TRUE_IN_TESTCODE_TMPL = textwrap.dedent(
+    """
+    .. testcode::
+        :skipif: True
+
+        {testcode}
+
+    .. testoutput::
+        :skipif: False
+
+        NOT EVALUATED
+    """
+)
+
+
 class TestDirectives:
     def test_testcode(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner
     ) -> None:
-        code = """
+        code = textwrap.dedent(
+            """
             .. testcode::
 
                 print("msg from testcode directive")
@@ -121,33 +201,41 @@ class TestDirectives:
 
                 msg from testcode directive
             """
+        )
 
         sphinx_output = sphinx_tester(code)
         assert "1 items passed all tests" in sphinx_output
 
-        plugin_result = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_result = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
         plugin_result.fnmatch_lines(["*=== 1 passed in *"])
 
     def test_doctest(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner
     ) -> None:
-        code = """
+        code = textwrap.dedent(
+            """
             .. doctest::
 
                >>> print("msg from testcode directive")
                msg from testcode directive
             """
+        )
 
         sphinx_output = sphinx_tester(code)
         assert "1 items passed all tests" in sphinx_output
 
-        plugin_result = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_result = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
         plugin_result.fnmatch_lines(["*=== 1 passed in *"])
 
     def test_doctest_multiple(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner
     ) -> None:
-        code = """
+        code = textwrap.dedent(
+            """
             .. doctest::
 
                 >>> import operator
@@ -168,36 +256,30 @@ class TestDirectives:
                 >>> print(f'Two plus two: {four}')
                 Two plus two: 4
             """
+        )
 
         sphinx_output = sphinx_tester(code)
         assert "1 items passed all tests" in sphinx_output
 
-        plugin_result = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_result = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
         plugin_result.fnmatch_lines(["*=== 1 passed in *"])
 
     @pytest.mark.parametrize("testcode", ["raise RuntimeError", "pass", "print(1234)"])
     def test_skipif_true(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner, testcode: str
     ) -> None:
-        code = """
-            .. testcode::
-
-                {}
-
-            .. testoutput::
-                :skipif: True
-
-                NOT EVALUATED
-            """.format(
-            testcode
-        )
+        code = _SKIPIF_TRUE_TMPL.format(testcode=testcode)
 
         raise_in_testcode = testcode != "pass"
         sphinx_output = sphinx_tester(code, must_raise=raise_in_testcode)
 
         # -> ignore the testoutput section if skipif evaluates to True, but
         # -> always run the code in testcode
-        plugin_output = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_output = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
 
         if raise_in_testcode:
             assert "1 failure in tests" in sphinx_output
@@ -212,23 +294,14 @@ class TestDirectives:
     def test_skipif_false(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner, testcode: str
     ) -> None:
-        code = """
-            .. testcode::
-
-                {}
-
-            .. testoutput::
-                :skipif: False
-
-                EVALUATED
-            """.format(
-            testcode
-        )
+        code = _SKIPIF_FALSE_TMPL.format(testcode=testcode)
 
         expected_failure = "EVALUATED" not in testcode
 
         sphinx_output = sphinx_tester(code, must_raise=expected_failure)
-        plugin_output = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_output = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
 
         if expected_failure:
             assert "1 failure in tests" in sphinx_output
@@ -247,24 +320,8 @@ class TestDirectives:
         # TODO add test, where there are muliple un-skipped testoutput
         # sections. IMO this must lead to a testfailure, which is currently
         # not the case in sphinx -> Create sphinx ticket
-        code = """
-            .. testcode::
-
-                raise RuntimeError
-
-            .. testoutput::
-                :skipif: True
-
-                NOT EVALUATED
-
-            .. testoutput::
-                :skipif: False
-
-                Traceback (most recent call last):
-                    ...
-                {}
-            """.format(
-            "ValueError" if wrong_output_assertion else "RuntimeError"
+        code = _SKIPIF_MULTIPLE_TESTOUTPUT_TMPL.format(
+            exception="ValueError" if wrong_output_assertion else "RuntimeError"
         )
 
         # -> ignore all skipped testoutput sections, but use the one that is
@@ -272,7 +329,9 @@ class TestDirectives:
 
         sphinx_output = sphinx_tester(code, must_raise=wrong_output_assertion)
 
-        plugin_output = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_output = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
 
         if wrong_output_assertion:
             assert "1 failure in tests" in sphinx_output
@@ -285,22 +344,12 @@ class TestDirectives:
     def test_skipif_true_in_testcode(
         self, testdir: Testdir, sphinx_tester: SphinxDoctestRunner, testcode: str
     ) -> None:
-        code = """
-            .. testcode::
-                :skipif: True
-
-                {}
-
-            .. testoutput::
-                :skipif: False
-
-                NOT EVALUATED
-            """.format(
-            testcode
-        )
+        code = _SKIPIF_TRUE_IN_TESTCODE_TMPL.format(testcode=testcode)
 
         sphinx_output = sphinx_tester(code, must_raise=False)
         assert "0 tests" in sphinx_output
 
-        plugin_output = testdir.runpytest("--doctest-glob=index.rst").stdout
+        plugin_output = testdir.runpytest(
+            "--doctest-glob=index.rst", str(sphinx_tester.tmp_path)
+        ).stdout
         plugin_output.fnmatch_lines(["collected 0 items"])